@@ -1,15 +1,24 @@
+import atexit
 import click
-from typing import List, Dict, Tuple, Any
-from botocore.exceptions import ClientError
+import functools
+import hashlib
+import importlib
+import itertools
+from typing import List, Dict, Tuple, Any, Optional
+from botocore.config import Config
+from botocore.exceptions import ClientError, ParamValidationError
 import boto3
+import io
 import json
 import os
+import random
+import re
 import time
 import uuid
 import sys
+import threading
 import yaml
 from pathlib import Path
-from datetime import datetime
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Attempt to import questionary for interactive mode
@@ -18,6 +27,18 @@ try:
 except ImportError:
     questionary = None
 
+# Prefer libyaml's C loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as YamlSafeLoader
+except ImportError:
+    from yaml import SafeLoader as YamlSafeLoader
+
+# Attempt to import orjson for faster parsing/serialization of SFN outputs
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # --- CLI Settings ---
 # Root directory for all test suites.
 TEST_SUITES_DIR = "tests"
@@ -25,93 +46,687 @@ TEST_SUITES_DIR = "tests"
 # CLI log file name (for internal debugging).
 CLI_LOG_FILE = "cli_debug.log"
 
+# Log level of the CLI log file; set CLI_LOG_LEVEL=DEBUG to also record full SFN outputs.
+LOG_LEVEL = os.environ.get("CLI_LOG_LEVEL", "INFO").upper()
+
 # AI Configuration file.
 CONFIG_FILE = "config.yaml"
 
-# Initialize AWS clients.
-try:
-    stepfunctions_client = boto3.client('stepfunctions')
-    cloudwatch_logs_client = boto3.client('logs')
-except Exception as e:
-    click.echo(f"Erro ao inicializar clientes AWS. Verifique suas credenciais e configuração. Detalhe: {e}", err=True)
-    sys.exit(1)
+# Directories never scanned when building the AI generation context.
+CONTEXT_EXCLUDED_DIRS = frozenset({'.git', '__pycache__', 'node_modules', '.venv'})
+# Files included in the AI generation context (by extension or exact name).
+CONTEXT_FILE_EXTENSIONS = frozenset({'.py', '.yaml', '.yml', '.json', '.ts', '.js', '.md'})
+CONTEXT_FILE_NAMES = frozenset({'requirements.txt', 'package.json', 'Dockerfile'})
+# Only the head of each context file is sent to the AI.
+CONTEXT_FILE_HEAD_CHARS = 4000
+# Larger files are skipped (usually generated bundles, lock files or data dumps).
+CONTEXT_MAX_FILE_BYTES = 1024 * 1024
+# Total size budget of the AI generation context, well under the models' context windows.
+CONTEXT_MAX_TOTAL_CHARS = 200 * 1024
+
+# Characters removed from scenario descriptions to build file names. Unicode-aware
+# like str.isalnum(), so accented letters (e.g. "validação") are kept.
+_FILENAME_STRIP_RE = re.compile(r'\W+')
+
+# Polling of running executions: exponential backoff with jitter (seconds).
+POLL_INITIAL_DELAY = 0.25
+POLL_MAX_DELAY = 10
+POLL_BACKOFF_FACTOR = 1.5
+# Jitter is proportional to the current interval so parallel pollers drift apart.
+POLL_JITTER_RATIO = 0.5
+# Minimum poll interval once an execution has been running for a while: (elapsed, delay).
+POLL_DELAY_FLOORS = ((60, 5), (10, 2))
+
+# Failure analyses run in the background, so N failures don't serialize N LLM calls.
+AI_ANALYSIS_MAX_WORKERS = 4
+_PENDING_ANALYSES: List[Tuple[str, Any]] = []
+_PENDING_ANALYSES_LOCK = threading.Lock()
+
+# In --parallel mode, up to this many executions of one State Machine are checked with
+# describe_execution; beyond that, one list_executions(statusFilter='RUNNING') is cheaper.
+POLL_DESCRIBE_MAX_EXECUTIONS = 3
+
+# Spinner redraw interval, independent from the polling cadence (seconds).
+SPINNER_INTERVAL = 0.1
+
+# Default bound of concurrent test executions in --parallel mode (jobs are I/O-bound); see --max-parallel.
+MAX_PARALLEL_TESTS = 32
+
+# Execution names are built from a per-process prefix plus a counter.
+_EXECUTION_NAME_PREFIX = uuid.uuid4().hex[:12]
+_EXECUTION_COUNTER = itertools.count(1)
+
+# Serializes log file writes when tests run in parallel threads.
+_LOG_LOCK = threading.Lock()
+
+# Log file descriptor (append mode), opened on the first flush and kept open for the whole process.
+_LOG_FD = None
+
+# Pending log lines are kept per thread, so each test's lines land in the file as one contiguous block.
+_LOG_TLS = threading.local()
+# Every thread's buffer, so lines left by helper threads are still written at exit.
+_LOG_THREAD_BUFFERS: List[List[bytes]] = []
+_LOG_BUFFER_SIZE = 64
+
+# Express executions last at most 5 minutes; synchronous calls wait a bit longer (seconds).
+SYNC_EXECUTION_READ_TIMEOUT = 310
+
+# State Machine type (STANDARD/EXPRESS) by ARN, filled during name lookups.
+_STATE_MACHINE_TYPES: Dict[str, str] = {}
+
+# On-disk cache of AI context file heads per project, revalidated by mtime and size.
+CONTEXT_CACHE_DIR = Path.home() / ".cache" / "aws-integration-tests-cli" / "context"
+# Files whose heads are never written to the context cache: the CLI config (API keys) and likely secrets.
+_CONTEXT_CACHE_SENSITIVE_RE = re.compile(r'key|secret|credential|token|password|\.env', re.IGNORECASE)
+
+# On-disk cache of generated scenarios, keyed by provider, model, prompt and context (seconds).
+SCENARIO_CACHE_DIR = Path.home() / ".cache" / "aws-integration-tests-cli" / "scenarios"
+SCENARIO_CACHE_TTL = 7 * 24 * 60 * 60
+
+# On-disk cache of State Machine lookups shared across CLI invocations. Misses expire
+# sooner so newly deployed State Machines are picked up quickly (seconds).
+SFN_CACHE_FILE = Path.home() / ".cache" / "aws-integration-tests-cli" / "sfn_arns.json"
+SFN_CACHE_TTL = 24 * 60 * 60
+SFN_CACHE_NEGATIVE_TTL = 5 * 60
+_SFN_DISK_CACHE = None
+_SFN_DISK_CACHE_DIRTY = False
+_SFN_DISK_CACHE_LOCK = threading.Lock()
+
+# lru_cache does not stop concurrent misses; this keeps parallel lookups to a single STS call.
+_ARN_PREFIX_LOCK = threading.Lock()
+
+# AWS client configuration: botocore's adaptive mode handles throttling with backoff,
+# and the connection pool is sized for parallel test runs (see _size_aws_client_pool).
+AWS_CLIENT_CONFIG = Config(
+    max_pool_connections=64,
+    retries={'max_attempts': 10, 'mode': 'adaptive'},
+    tcp_keepalive=True,
+)
+
+# boto3 sessions are not thread-safe, and lazy clients may first be built from worker threads.
+_AWS_SESSION_LOCK = threading.Lock()
+
+@functools.lru_cache(maxsize=None)
+def _aws_session() -> boto3.session.Session:
+    """Returns the boto3 session shared by every client (call with _AWS_SESSION_LOCK held)."""
+    return boto3.session.Session()
+
+def _size_aws_client_pool(max_parallel: int):
+    """Grows the connection pool so every parallel worker, plus the poller, gets its own connection."""
+    global AWS_CLIENT_CONFIG
+    needed = max_parallel + 1
+    if needed > AWS_CLIENT_CONFIG.max_pool_connections:
+        AWS_CLIENT_CONFIG = AWS_CLIENT_CONFIG.merge(Config(max_pool_connections=needed))
+
+def _create_aws_client(service_name: str, config: Config = None):
+    """Creates a boto3 client with the shared session and config, exiting on failure."""
+    try:
+        with _AWS_SESSION_LOCK:
+            return _aws_session().client(service_name, config=config or AWS_CLIENT_CONFIG)
+    except Exception as e:
+        click.echo(f"Erro ao inicializar clientes AWS. Verifique suas credenciais e configuração. Detalhe: {e}", err=True)
+        sys.exit(1)
+
+# AWS clients are created lazily, so commands like 'list' and 'generate' never build them.
+@functools.lru_cache(maxsize=None)
+def _sfn_client():
+    """Returns the shared Step Functions client."""
+    return _create_aws_client('stepfunctions')
+
+@functools.lru_cache(maxsize=None)
+def _sfn_sync_client():
+    """Returns the Step Functions client used for synchronous Express executions."""
+    # start_sync_execution blocks for the whole run, so the read timeout must cover it. It is not
+    # idempotent: a retry after a timeout or 5xx would run the workflow (and its side effects) again.
+    return _create_aws_client('stepfunctions', AWS_CLIENT_CONFIG.merge(Config(
+        read_timeout=SYNC_EXECUTION_READ_TIMEOUT,
+        retries={'total_max_attempts': 1},
+    )))
+
+@functools.lru_cache(maxsize=None)
+def _sts_client():
+    """Returns the shared STS client."""
+    return _create_aws_client('sts')
+
+# --- Console Styling ---
+# ANSI styling is only built when stdout is a terminal; otherwise text is passed through.
+_IS_TTY = sys.stdout.isatty()
+
+def _style(text, **styles):
+    """Applies click styling only when writing to a terminal."""
+    return click.style(text, **styles) if _IS_TTY else text
+
+# Strips ANSI color codes from log file entries.
+_ANSI_RE = re.compile(r'\x1b\[[0-9;]*m')
+
+# Fixed banners, styled once at startup.
+_RESULT_FOOTER = _style("-----------------------------------------\n", fg='cyan')
+_STATUS_SUCCEEDED = _style("Status AWS: SUCCEEDED", fg='green')
+_STATUS_FAILED = _style("Status AWS: FAILED", fg='red')
+_SUMMARY_HEADER = _style("\n--- Resumo Final da Execução ---", fg='cyan', bold=True)
+_SUMMARY_FOOTER = _style("--------------------------\n", fg='cyan', bold=True)
+_AI_ANALYSIS_HEADER = _style("--- Análise da IA ---", fg='magenta', bold=True)
+_AI_ANALYSIS_FOOTER = _style("---------------------", fg='magenta', bold=True)
 
 # --- Helper Functions ---
 
+# Stdlib decoder for raw_decode(), which parses a JSON value embedded in surrounding text.
+_JSON_DECODER = json.JSONDecoder()
+
+def _json_loads(data):
+    """Parses JSON with orjson when available, falling back to the stdlib."""
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _json_dumps_compact(obj) -> str:
+    """Serializes an object as compact UTF-8 JSON (no whitespace, no ASCII escaping)."""
+    if orjson:
+        try:
+            return orjson.dumps(obj).decode()
+        except TypeError:
+            # orjson rejects integers beyond 64 bits (e.g. boundary values in scenarios); the stdlib does not.
+            pass
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
+
+def _json_dumps_pretty(obj) -> str:
+    """Serializes an object as UTF-8 JSON indented by two spaces."""
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, indent=2, ensure_ascii=False)
+
+def _write_json_file(path: Path, obj):
+    """Writes an object as indented UTF-8 JSON; orjson's bytes go straight to the file."""
+    if orjson:
+        try:
+            # Serialized before opening, so a failure never leaves an empty file behind.
+            data = orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # orjson rejects integers beyond 64 bits (e.g. boundary values); the stdlib writes them.
+            data = None
+        if data is not None:
+            with open(path, "wb") as f:
+                f.write(data)
+            return
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(obj, f, indent=2, ensure_ascii=False)
+
+def _thread_log_buffer() -> List[bytes]:
+    """Returns the calling thread's pending log lines."""
+    buffer = getattr(_LOG_TLS, 'buffer', None)
+    if buffer is None:
+        buffer = _LOG_TLS.buffer = []
+        with _LOG_LOCK:
+            _LOG_THREAD_BUFFERS.append(buffer)
+    return buffer
+
+def _flush_log(buffer: List[bytes] = None):
+    """Writes pending log lines (by default, the calling thread's) to the log file in a single syscall."""
+    global _LOG_FD
+    if buffer is None:
+        buffer = _thread_log_buffer()
+    if not buffer:
+        return
+    with _LOG_LOCK:
+        if _LOG_FD is None:
+            flags = os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, 'O_BINARY', 0)
+            _LOG_FD = os.open(CLI_LOG_FILE, flags, 0o644)
+        if hasattr(os, 'writev'):
+            os.writev(_LOG_FD, buffer)
+        else:
+            # os.writev is POSIX-only (not available on Windows).
+            os.write(_LOG_FD, b"".join(buffer))
+    buffer.clear()
+
+def _close_log():
+    """Drains pending log lines of all threads and closes the log file (safe to call more than once)."""
+    global _LOG_FD
+    with _LOG_LOCK:
+        buffers = list(_LOG_THREAD_BUFFERS)
+    for buffer in buffers:
+        _flush_log(buffer)
+    with _LOG_LOCK:
+        if _LOG_FD is None:
+            return
+        os.close(_LOG_FD)
+        _LOG_FD = None
+
+atexit.register(_close_log)
+
+# (second, formatted) of the last log timestamp; replaced as a whole, so threads never see a torn pair.
+_LOG_TIMESTAMP = (0, "")
+
+def _log_timestamp() -> str:
+    """Returns the log timestamp, formatting it at most once per second."""
+    global _LOG_TIMESTAMP
+    second = int(time.time())
+    cached_second, formatted = _LOG_TIMESTAMP
+    if second != cached_second:
+        formatted = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(second))
+        _LOG_TIMESTAMP = (second, formatted)
+    return formatted
+
 def log_message(message, level="INFO", err=False, console=True):
     """Escreve mensagens no console e/ou em um arquivo de log."""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    # Remove ANSI color codes for clean log files
-    clean_message = click.unstyle(str(message))
+    timestamp = _log_timestamp()
+    # Remove ANSI color codes for clean log files; most messages are plain and skip the regex.
+    clean_message = str(message)
+    if '\x1b' in clean_message:
+        clean_message = _ANSI_RE.sub('', clean_message)
     log_entry = f"[{timestamp}] [{level}] {clean_message}"
     
     # Print to console (stderr for errors).
     if console:
         click.echo(message, err=err)
     
-    # Append to log file.
-    with open(CLI_LOG_FILE, "a", encoding='utf-8') as f:
-        f.write(log_entry + "\n")
+    # Queue for the log file; errors and warnings are flushed right away.
+    buffer = _thread_log_buffer()
+    buffer.append(f"{log_entry}\n".encode('utf-8'))
+    if len(buffer) >= _LOG_BUFFER_SIZE or level in ("ERROR", "WARNING"):
+        _flush_log()
+
+@functools.lru_cache(maxsize=256)
+def _read_scenario_bytes(path: str, mtime_ns: int, size: int) -> bytes:
+    """Lê o conteúdo bruto de um cenário; a chave inclui mtime e tamanho, então edições invalidam o cache."""
+    with open(path, 'rb') as f:
+        return f.read()
+
+def _scenario_schema_error(scenario) -> Optional[str]:
+    """Confere a estrutura mínima de um cenário; retorna a descrição do problema ou None se for válido."""
+    if not isinstance(scenario, dict):
+        return "o cenário deve ser um objeto JSON"
+    if 'input' not in scenario:
+        return "campo obrigatório 'input' ausente"
+    if 'description' in scenario and not isinstance(scenario['description'], str):
+        return "o campo 'description' deve ser uma string"
+    if 'expected' in scenario and not isinstance(scenario['expected'], dict):
+        return "o campo 'expected' deve ser um objeto JSON"
+    return None
 
 def load_scenario(scenario_path: Path):
     """Carrega um cenário de teste a partir de um arquivo JSON."""
-    if not scenario_path.exists():
+    try:
+        # A single stat() both checks existence and builds the cache key.
+        st = scenario_path.stat()
+    except FileNotFoundError:
         log_message(f"Erro: Arquivo de cenário de teste '{scenario_path}' não encontrado.", level="ERROR", err=True)
         return None
     try:
-        with open(scenario_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        raw = _read_scenario_bytes(str(scenario_path), st.st_mtime_ns, st.st_size)
+        # Parsing the cached bytes yields a fresh object, so callers may mutate it (e.g. testRunId).
+        # Stdlib json on purpose: orjson turns integers beyond 64 bits into floats and rejects
+        # NaN/Infinity, which would change the input a scenario file asks for.
+        scenario = json.loads(raw)
     except json.JSONDecodeError as e:
         log_message(f"Erro ao ler arquivo de cenário '{scenario_path.name}': JSON inválido. {e}", level="ERROR", err=True)
         return None
     except Exception as e:
         log_message(f"Erro inesperado ao carregar cenário '{scenario_path.name}': {e}", level="ERROR", err=True)
         return None
+    # Reject malformed scenarios locally instead of paying for a Step Functions execution to find out.
+    schema_error = _scenario_schema_error(scenario)
+    if schema_error:
+        log_message(f"Erro: Cenário '{scenario_path.name}' inválido: {schema_error}. Ignorando.", level="ERROR", err=True)
+        return None
+    return scenario
+
+def _list_suite_dirs(root_path: Path) -> List[Path]:
+    """Lista os diretórios de suíte em 'root_path', ordenados por nome."""
+    # DirEntry.is_dir() reuses the dirent type instead of issuing a new stat().
+    with os.scandir(root_path) as entries:
+        return sorted(Path(entry.path) for entry in entries if entry.is_dir())
+
+def _list_scenario_files(cases_dir: Path) -> List[Tuple[str, Path]]:
+    """Lista os cenários (.json) de uma pasta 'cases' como pares (nome, caminho), ordenados por nome."""
+    with os.scandir(cases_dir) as entries:
+        # The stem comes straight from the dirent name, without building a Path just to strip it.
+        return sorted((entry.name[:-5], Path(entry.path)) for entry in entries if entry.name.endswith('.json') and entry.is_file())
+
+@functools.lru_cache(maxsize=None)
+def _get_state_machine_arn_prefix() -> str:
+    """Monta o prefixo dos ARNs de State Machine da conta e região atuais."""
+    identity = _sts_client().get_caller_identity()
+    partition = identity['Arn'].split(':')[1]
+    region = _sfn_client().meta.region_name
+    return f"arn:{partition}:states:{region}:{identity['Account']}:stateMachine:"
+
+@functools.lru_cache(maxsize=None)
+def _get_sfn_cache_scope() -> Optional[str]:
+    """Identifica conta e região atuais, sem chamadas de rede, para isolar o cache em disco."""
+    with _AWS_SESSION_LOCK:
+        session = _aws_session()
+        credentials = session.get_credentials()
+        profile_config = session._session.get_scoped_config()
+    if not credentials or not session.region_name:
+        return None
+    # SSO and assume-role keys rotate every session, but the profile names the account/role they
+    # belong to. Anything else (static keys, instance roles) is identified by its access key, so
+    # switching accounts never reuses another account's ARNs.
+    method = credentials.method or ''
+    if method == 'sso' and profile_config.get('sso_account_id'):
+        identity = f"sso:{profile_config['sso_account_id']}:{profile_config.get('sso_role_name')}"
+    elif method.startswith('assume-role') and profile_config.get('role_arn'):
+        identity = f"role:{profile_config['role_arn']}"
+    else:
+        identity = f"key:{credentials.access_key}"
+    return hashlib.sha256(f"{identity}:{session.region_name}".encode()).hexdigest()
+
+def _load_sfn_disk_cache() -> Dict[str, Any]:
+    """Carrega o cache em disco na primeira utilização (chamar com o lock adquirido)."""
+    global _SFN_DISK_CACHE
+    if _SFN_DISK_CACHE is None:
+        try:
+            _SFN_DISK_CACHE = json.loads(SFN_CACHE_FILE.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            _SFN_DISK_CACHE = {}
+    return _SFN_DISK_CACHE
+
+def _is_sfn_cache_entry_expired(entry: Dict[str, Any], now: float = None) -> bool:
+    """Indica se uma entrada do cache em disco passou da validade (menor para nomes não encontrados)."""
+    ttl = SFN_CACHE_TTL if entry['arn'] else SFN_CACHE_NEGATIVE_TTL
+    return (now or time.time()) - entry['ts'] > ttl
+
+def _get_disk_cached_state_machine(scope: str, name: str):
+    """Retorna a entrada {'arn', 'type'} em cache para 'name', se ainda estiver válida."""
+    with _SFN_DISK_CACHE_LOCK:
+        entry = _load_sfn_disk_cache().get(scope, {}).get(name)
+    if not entry or _is_sfn_cache_entry_expired(entry):
+        return None
+    return entry
+
+def _set_disk_cached_state_machine(scope: str, name: str, arn: str, state_machine_type: str):
+    """Registra o resultado de uma busca no cache em disco (gravado ao final da execução)."""
+    global _SFN_DISK_CACHE_DIRTY
+    with _SFN_DISK_CACHE_LOCK:
+        _load_sfn_disk_cache().setdefault(scope, {})[name] = {'arn': arn, 'type': state_machine_type, 'ts': time.time()}
+        _SFN_DISK_CACHE_DIRTY = True
+
+def _invalidate_disk_cached_state_machine(state_machine_arn: str):
+    """Remove do cache em disco as entradas que apontam para 'state_machine_arn' (ex: apagada ou de outra conta)."""
+    global _SFN_DISK_CACHE_DIRTY
+    scope = _get_sfn_cache_scope()
+    if not scope:
+        return
+    with _SFN_DISK_CACHE_LOCK:
+        entries = _load_sfn_disk_cache().get(scope, {})
+        for name in [name for name, entry in entries.items() if entry['arn'] == state_machine_arn]:
+            del entries[name]
+            _SFN_DISK_CACHE_DIRTY = True
+
+def _save_sfn_disk_cache():
+    """Grava o cache em disco de forma atômica, se houve alterações."""
+    if not _SFN_DISK_CACHE_DIRTY:
+        return
+    now = time.time()
+    with _SFN_DISK_CACHE_LOCK:
+        # Expired entries and emptied scopes are dropped, so the file does not grow without bound.
+        pruned = {}
+        for scope, entries in _SFN_DISK_CACHE.items():
+            live_entries = {name: entry for name, entry in entries.items() if not _is_sfn_cache_entry_expired(entry, now)}
+            if live_entries:
+                pruned[scope] = live_entries
+    try:
+        SFN_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = SFN_CACHE_FILE.with_suffix('.tmp')
+        tmp_path.write_text(json.dumps(pruned), encoding='utf-8')
+        os.replace(tmp_path, SFN_CACHE_FILE)
+    except OSError as e:
+        log_message(f"Não foi possível gravar o cache de State Machines: {e}", level="WARNING", console=False)
+
+# Registered after _close_log, so it runs before the log file is closed (atexit is LIFO).
+atexit.register(_save_sfn_disk_cache)
+
+def _arn_override_env_var(name: str) -> str:
+    """Nome da variável de ambiente que fixa o ARN da suíte 'name' (ex: SFN_ARN_PROCESSORDERFLOW)."""
+    return "SFN_ARN_" + re.sub(r'\W', '_', name).upper()
+
+@functools.lru_cache(maxsize=None)
+def _lookup_state_machine_arn(name: str) -> str:
+    """Valida o ARN construído (ou fixado) para 'name' com uma única chamada; retorna None se não existir.
+
+    Levanta ValueError se o ARN fixado em SFN_ARN_<NOME> for de outra região.
+    """
+    override_arn = os.environ.get(_arn_override_env_var(name))
+    if override_arn:
+        # Every call (describe, start, polling) goes through the session's regional client.
+        arn_parts = override_arn.split(':')
+        session_region = _sfn_client().meta.region_name
+        if len(arn_parts) > 3 and arn_parts[3] != session_region:
+            raise ValueError(
+                f"O ARN em {_arn_override_env_var(name)} é da região '{arn_parts[3]}', mas a sessão AWS usa '{session_region}'. "
+                "Defina AWS_REGION (ou AWS_DEFAULT_REGION) com a região da State Machine."
+            )
+        # An explicit ARN needs neither STS nor the disk cache; describe still yields the type.
+        scope = None
+        arn = override_arn
+    else:
+        scope = _get_sfn_cache_scope()
+        cached = _get_disk_cached_state_machine(scope, name) if scope else None
+        if cached:
+            if cached['arn']:
+                _STATE_MACHINE_TYPES[cached['arn']] = cached['type']
+            return cached['arn']
+
+        with _ARN_PREFIX_LOCK:
+            arn_prefix = _get_state_machine_arn_prefix()
+        arn = arn_prefix + name
+    try:
+        state_machine = _sfn_client().describe_state_machine(stateMachineArn=arn)
+    except ClientError as e:
+        # Missing (or invalid) names are cached as None like any other result.
+        if e.response['Error']['Code'] in ('StateMachineDoesNotExist', 'InvalidArn'):
+            if scope:
+                _set_disk_cached_state_machine(scope, name, None, None)
+            return None
+        raise
+    state_machine_type = state_machine.get('type', 'STANDARD')
+    _STATE_MACHINE_TYPES[arn] = state_machine_type
+    if scope:
+        _set_disk_cached_state_machine(scope, name, arn, state_machine_type)
+    return arn
 
 def find_state_machine_arn(name: str) -> str:
     """Busca o ARN de uma State Machine pelo nome exato."""
     log_message(f"Buscando ARN para a State Machine com nome exato: '{name}'...")
     try:
-        # Cache results to avoid multiple API calls for the same SFN name
-        if not hasattr(find_state_machine_arn, "cache"):
-            find_state_machine_arn.cache = {}
-        
-        if name in find_state_machine_arn.cache:
-            arn = find_state_machine_arn.cache[name]
-            if arn:
-                log_message(f"State Machine encontrada no cache: {name}")
-            return arn
-
-        paginator = stepfunctions_client.get_paginator('list_state_machines')
-        for page in paginator.paginate():
-            for sm in page['stateMachines']:
-                if sm['name'] == name:
-                    log_message(f"State Machine encontrada na AWS: {sm['name']} ({sm['stateMachineArn']})")
-                    find_state_machine_arn.cache[name] = sm['stateMachineArn']
-                    return sm['stateMachineArn']
-        
-        log_message(f"Erro: Nenhuma State Machine com o nome '{name}' foi encontrada.", level="ERROR", err=True)
-        find_state_machine_arn.cache[name] = None
-        return None
+        arn = _lookup_state_machine_arn(name)
     except ClientError as e:
-        log_message(f"Erro AWS ao listar State Machines: {e}", level="ERROR", err=True)
+        log_message(f"Erro AWS ao buscar a State Machine '{name}': {e}", level="ERROR", err=True)
+        return None
+    except ValueError as e:
+        log_message(f"Erro: {e}", level="ERROR", err=True)
         return None
 
-def get_sfn_execution_details(execution_arn):
-    """Obtém detalhes de uma execução da Step Functions."""
+    if arn:
+        log_message(f"State Machine encontrada: {name} ({arn})")
+    else:
+        log_message(f"Erro: Nenhuma State Machine com o nome '{name}' foi encontrada.", level="ERROR", err=True)
+    return arn
+
+def _resolve_arns(names: List[str]) -> Dict[str, str]:
+    """Resolve em paralelo os ARNs das State Machines, mapeando nome -> ARN (ou None)."""
+    # Repeated names would race each other past the lru_cache; look each one up once.
+    names = list(dict.fromkeys(names))
+    if not names:
+        return {}
+    # Lookups are network-bound, so overlap them; the client pool is sized for this.
+    with ThreadPoolExecutor(max_workers=min(16, len(names))) as executor:
+        return dict(zip(names, executor.map(_find_state_machine_arn_and_flush, names)))
+
+def _find_state_machine_arn_and_flush(name: str) -> str:
+    """find_state_machine_arn for worker threads: writes the lookup's log lines before returning."""
     try:
-        response = stepfunctions_client.describe_execution(executionArn=execution_arn)
-        return response
-    except ClientError as e:
-        if e.response['Error']['Code'] == 'ThrottlingException':
-            time.sleep(2)
+        return find_state_machine_arn(name)
+    finally:
+        _flush_log()
+
+def get_sfn_execution_details(execution_arn, metadata_only=False):
+    """Obtém detalhes de uma execução da Step Functions.
+
+    Com 'metadata_only', input e output não são transferidos (útil durante o polling).
+    """
+    try:
+        if metadata_only:
+            return _sfn_client().describe_execution(executionArn=execution_arn, includedData='METADATA_ONLY')
+        return _sfn_client().describe_execution(executionArn=execution_arn)
+    except ParamValidationError:
+        # Older botocore releases don't know 'includedData'; use a full describe instead.
+        if metadata_only:
             return get_sfn_execution_details(execution_arn)
+        raise
+    except ClientError as e:
         log_message(f"Erro AWS ao descrever execução {execution_arn}: {e}", level="ERROR", err=True)
         return None
     except Exception as e:
         log_message(f"Erro inesperado ao descrever execução {execution_arn}: {e}", level="ERROR", err=True)
         return None
 
+def _jittered_delay(delay: float) -> float:
+    """Adds proportional jitter to a poll interval, so concurrent pollers drift apart."""
+    return delay + random.uniform(0, delay * POLL_JITTER_RATIO)
+
+def _next_poll_delay(delay: float, elapsed: float) -> float:
+    """Grows the poll interval toward POLL_MAX_DELAY, honoring POLL_DELAY_FLOORS after 'elapsed' seconds."""
+    delay = min(delay * POLL_BACKOFF_FACTOR, POLL_MAX_DELAY)
+    for min_elapsed, min_delay in POLL_DELAY_FLOORS:
+        if elapsed >= min_elapsed:
+            return max(delay, min_delay)
+    return delay
+
+class _ExecutionPoller:
+    """Acompanha, em uma única thread, todas as execuções em andamento no modo paralelo.
+
+    O intervalo entre ciclos segue o mesmo backoff do modo sequencial, reiniciado quando uma
+    execução começa ou termina. Por State Machine, poucas execuções são consultadas com
+    describe_execution; muitas, com um list_executions(statusFilter='RUNNING') que para de
+    paginar assim que todas as execuções acompanhadas aparecem. As que saíram da lista são
+    confirmadas com describe_execution (a listagem é eventualmente consistente).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        # Set once the thread has stopped; later waits return at once instead of blocking forever.
+        self._stopped = False
+        self._stop = threading.Event()
+        # Set when an execution is registered (or on close), so a long backoff sleep is cut short.
+        self._wakeup = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="sfn-poller", daemon=True)
+        self._thread.start()
+
+    def wait(self, execution_arn: str) -> dict:
+        """Bloqueia até a execução terminar e retorna seus metadados (ou None em caso de erro)."""
+        slot = {'done': threading.Event(), 'details': None}
+        with self._lock:
+            if self._stopped:
+                return None
+            self._pending[execution_arn] = slot
+        self._wakeup.set()
+        slot['done'].wait()
+        return slot['details']
+
+    def close(self):
+        """Encerra a thread de polling."""
+        self._stop.set()
+        self._wakeup.set()
+        self._thread.join()
+
+    def _run(self):
+        try:
+            self._poll_loop()
+        finally:
+            # Whatever stops the thread, no worker may be left waiting on it.
+            self._release_pending()
+            _flush_log()
+
+    def _release_pending(self):
+        """Libera todas as esperas pendentes sem detalhes (reportadas como falha pelos workers)."""
+        with self._lock:
+            self._stopped = True
+            slots = list(self._pending.values())
+            self._pending.clear()
+        for slot in slots:
+            slot['done'].set()
+
+    def _poll_loop(self):
+        delay = POLL_INITIAL_DELAY
+        backoff_start = time.monotonic()
+        next_poll = backoff_start + _jittered_delay(delay)
+        while True:
+            self._wakeup.wait(max(0.0, next_poll - time.monotonic()))
+            if self._stop.is_set():
+                break
+            now = time.monotonic()
+            if self._wakeup.is_set():
+                # A new execution restarts the backoff; it is checked soon without postponing a due cycle.
+                self._wakeup.clear()
+                delay = POLL_INITIAL_DELAY
+                backoff_start = now
+                next_poll = min(next_poll, now + _jittered_delay(delay))
+                continue
+
+            try:
+                finished_any = self._poll_once()
+            except Exception as e:
+                # One bad cycle must not kill the thread every parallel worker is waiting on.
+                log_message(f"Erro inesperado ao acompanhar execuções: {e}", level="WARNING", console=False)
+                finished_any = False
+            if finished_any:
+                delay = POLL_INITIAL_DELAY
+                backoff_start = now
+            else:
+                delay = _next_poll_delay(delay, now - backoff_start)
+            next_poll = time.monotonic() + _jittered_delay(delay)
+
+    def _poll_once(self) -> bool:
+        """Consulta as execuções acompanhadas e libera as que terminaram; indica se alguma terminou."""
+        with self._lock:
+            pending = list(self._pending)
+        by_state_machine: Dict[str, List[str]] = {}
+        for execution_arn in pending:
+            # Execution ARNs embed the state machine name: ...:execution:<name>:<execution>.
+            state_machine_arn = ':'.join(execution_arn.split(':')[:7]).replace(':execution:', ':stateMachine:', 1)
+            by_state_machine.setdefault(state_machine_arn, []).append(execution_arn)
+
+        finished_any = False
+        for state_machine_arn, execution_arns in by_state_machine.items():
+            running = None
+            if len(execution_arns) > POLL_DESCRIBE_MAX_EXECUTIONS:
+                running = self._list_running(state_machine_arn, set(execution_arns))
+            for execution_arn in execution_arns:
+                if running is not None and execution_arn in running:
+                    continue
+                try:
+                    details = get_sfn_execution_details(execution_arn, metadata_only=True)
+                except Exception as e:
+                    # Released without details (a failure), so a persistent error cannot strand its worker.
+                    log_message(f"Erro ao consultar a execução {execution_arn}: {e}", level="WARNING", console=False)
+                    details = None
+                if details and details['status'] == 'RUNNING':
+                    continue
+                with self._lock:
+                    slot = self._pending.pop(execution_arn)
+                slot['details'] = details
+                slot['done'].set()
+                finished_any = True
+        return finished_any
+
+    def _list_running(self, state_machine_arn: str, tracked: set):
+        """Retorna quais execuções de 'tracked' estão em execução, ou None se a listagem falhar."""
+        try:
+            paginator = _sfn_client().get_paginator('list_executions')
+            running = set()
+            for page in paginator.paginate(stateMachineArn=state_machine_arn, statusFilter='RUNNING'):
+                running.update(execution['executionArn'] for execution in page['executions'] if execution['executionArn'] in tracked)
+                # Other users' and CI runs may fill further pages; stop once ours are all seen.
+                if len(running) == len(tracked):
+                    break
+            return running
+        except Exception as e:
+            # Fall back to one describe per execution for this cycle; the poller thread must not die.
+            log_message(f"Erro ao listar execuções de {state_machine_arn}: {e}", level="WARNING", console=False)
+            return None
+
 def validate_execution_result(execution_details: dict, scenario_config: dict) -> (bool, list):
     """Valida o resultado da execução com base no estado final da Step Function."""
     messages = []
@@ -125,67 +740,120 @@ def validate_execution_result(execution_details: dict, scenario_config: dict) ->
         messages.append(f"Erro: {execution_details.get('error')}, Causa: {execution_details.get('cause')}")
         return False, messages
 
-def monitor_sfn_execution(execution_arn: str, scenario_name: str, scenario_config: dict, analysis_enabled: bool, analysis_provider: str) -> bool:
-    """Aguarda a conclusão da execução, exibe o resultado e retorna o status de validação."""
-    log_message(f"Aguardando a conclusão do teste '{scenario_name}'...")
-    status = 'RUNNING'
+def _run_spinner(state: Dict[str, str], stop_event: threading.Event):
+    """Redraws the status spinner until 'stop_event' is set."""
     spinner = ['|', '/', '-', '\\']
     spin_idx = 0
-    execution_details = None
-
-    while status == 'RUNNING':
-        sys.stdout.write(f"\rStatus: {status} {spinner[spin_idx]} ")
+    while not stop_event.is_set():
+        sys.stdout.write(f"\rStatus: {state['status']} {spinner[spin_idx]} ")
         sys.stdout.flush()
         spin_idx = (spin_idx + 1) % len(spinner)
-        time.sleep(3)
-        execution_details = get_sfn_execution_details(execution_arn)
+        stop_event.wait(SPINNER_INTERVAL)
+
+def monitor_sfn_execution(execution_arn: str, scenario_name: str, scenario_config: dict, analysis_enabled: bool, analysis_provider: str, show_spinner: bool = True, poller: _ExecutionPoller = None) -> bool:
+    """Aguarda a conclusão da execução, exibe o resultado e retorna o status de validação.
+
+    Com um 'poller' compartilhado, a espera é delegada a ele em vez de consultar a AWS nesta thread.
+    """
+    log_message(f"Aguardando a conclusão do teste '{scenario_name}'...")
+    if poller:
+        execution_details = poller.wait(execution_arn)
         if execution_details:
-            status = execution_details['status']
-        else:
-            status = 'UNKNOWN'
-            break
+            execution_details = get_sfn_execution_details(execution_arn)
+        return _report_execution_result(execution_arn, scenario_name, execution_details, scenario_config, analysis_enabled, analysis_provider)
 
-    sys.stdout.write("\n")
+    status = 'RUNNING'
+    execution_details = None
+    delay = POLL_INITIAL_DELAY
+    poll_start = time.monotonic()
+
+    # The spinner redraws on its own thread; this loop only polls and updates the status.
+    spinner_state = {'status': status}
+    stop_spinner = threading.Event()
+    spinner_thread = None
+    # Without a terminal (e.g. CI logs) the spinner is invisible noise.
+    if show_spinner and _IS_TTY:
+        spinner_thread = threading.Thread(target=_run_spinner, args=(spinner_state, stop_spinner), daemon=True)
+        spinner_thread.start()
+    try:
+        while status == 'RUNNING':
+            time.sleep(_jittered_delay(delay))
+            delay = _next_poll_delay(delay, time.monotonic() - poll_start)
+
+            execution_details = get_sfn_execution_details(execution_arn, metadata_only=True)
+            if execution_details:
+                status = execution_details['status']
+            else:
+                status = 'UNKNOWN'
+            spinner_state['status'] = status
+    finally:
+        stop_spinner.set()
+        if spinner_thread:
+            spinner_thread.join()
+
+    # Input/output are only needed once the execution has finished.
+    if execution_details:
+        execution_details = get_sfn_execution_details(execution_arn)
+
+    if spinner_thread:
+        sys.stdout.write("\n")
+    return _report_execution_result(execution_arn, scenario_name, execution_details, scenario_config, analysis_enabled, analysis_provider)
 
-    log_message(click.style(f"\n--- Resultados do Teste: {scenario_name} ---", fg='cyan'))
+def _report_execution_result(execution_arn: str, scenario_name: str, execution_details: dict, scenario_config: dict, analysis_enabled: bool, analysis_provider: str) -> bool:
+    """Exibe o resultado final de uma execução e retorna se ela foi bem-sucedida."""
+    log_message(_style(f"\n--- Resultados do Teste: {scenario_name} ---", fg='cyan'))
     log_message(f"Execução: {execution_arn}")
 
     if not execution_details:
-        log_message(click.style("Não foi possível obter os detalhes finais da execução.", fg='red'), err=True)
+        log_message(_style("Não foi possível obter os detalhes finais da execução.", fg='red'), err=True)
         return False
 
+    start_date = execution_details.get('startDate')
+    stop_date = execution_details.get('stopDate')
+    final_status = execution_details.get('status', 'UNKNOWN')
+
     # Performance Measurement
-    if execution_details.get('startDate') and execution_details.get('stopDate'):
-        sfn_duration = execution_details['stopDate'] - execution_details['startDate']
+    if start_date and stop_date:
+        sfn_duration = stop_date - start_date
         log_message(f"Duração da Execução SFN: {sfn_duration.total_seconds():.2f} segundos")
 
-    try:
-        output = json.loads(execution_details.get('output', '{}'))
-        log_message(f"Output completo da SFN: {json.dumps(output, indent=2)}", console=False, level="DEBUG")
-    except (json.JSONDecodeError, TypeError):
-        log_message(f"Output completo da SFN (não JSON): {execution_details.get('output')}", console=False, level="DEBUG")
-
-    final_status = execution_details.get('status', 'UNKNOWN')
+    # The output is only parsed for this file-only debug line, so skip it unless someone will read it.
+    if LOG_LEVEL == "DEBUG":
+        raw_output = execution_details.get('output', '{}')
+        try:
+            output = _json_loads(raw_output)
+            # Compact JSON is enough and much cheaper than indenting.
+            log_message(f"Output completo da SFN: {_json_dumps_compact(output)}", console=False, level="DEBUG")
+        except (json.JSONDecodeError, TypeError):
+            log_message(f"Output completo da SFN (não JSON): {raw_output}", console=False, level="DEBUG")
 
     if final_status == 'SUCCEEDED':
-        log_message(click.style(f"Status AWS: SUCCEEDED", fg='green'))
+        log_message(_STATUS_SUCCEEDED)
     elif final_status == 'FAILED':
-        log_message(click.style(f"Status AWS: FAILED", fg='red'))
+        log_message(_STATUS_FAILED)
         log_message(f"Causa: {execution_details.get('cause', 'Não especificada.')}")
         log_message(f"Erro: {execution_details.get('error', 'Não especificado.')}")
         
         if analysis_enabled:
-            _invoke_ai_analysis(scenario_config, execution_details, analysis_provider)
+            _invoke_ai_analysis(scenario_name, scenario_config, execution_details, analysis_provider)
 
     else:
-        log_message(click.style(f"Status AWS: {final_status} {'❌' if final_status == 'FAILED' else '✅'}", fg='yellow'))
-    log_message(click.style("-----------------------------------------\n", fg='cyan'))
+        log_message(_style(f"Status AWS: {final_status} {'❌' if final_status == 'FAILED' else '✅'}", fg='yellow'))
+    log_message(_RESULT_FOOTER)
     return final_status == "SUCCEEDED"
 
-def _run_single_test(state_machine_arn: str, scenario_path: Path, wait: bool, analysis_enabled: bool, analysis_provider: str) -> bool:
+def _run_single_test(state_machine_arn: str, scenario_path: Path, wait: bool, analysis_enabled: bool, analysis_provider: str, show_spinner: bool = True, poller: _ExecutionPoller = None) -> bool:
     """Helper function to load, start, and monitor a single test case."""
+    try:
+        return _execute_test(state_machine_arn, scenario_path, wait, analysis_enabled, analysis_provider, show_spinner, poller)
+    finally:
+        # Test boundary: write this test's log lines out as one block.
+        _flush_log()
+
+def _execute_test(state_machine_arn: str, scenario_path: Path, wait: bool, analysis_enabled: bool, analysis_provider: str, show_spinner: bool, poller: _ExecutionPoller) -> bool:
+    """Loads, starts, and monitors a single test case."""
     scenario_name = scenario_path.stem
-    log_message(click.style(f"Executando cenário: {scenario_name}", bold=True))
+    log_message(_style(f"Executando cenário: {scenario_name}", bold=True))
 
     test_scenario_config = load_scenario(scenario_path)
     if not test_scenario_config:
@@ -197,12 +865,23 @@ def _run_single_test(state_machine_arn: str, scenario_path: Path, wait: bool, an
     if isinstance(sfn_input, dict):
         sfn_input['testRunId'] = test_run_id
 
-    execution_name = f"{scenario_name.replace('_', '-')}-{test_run_id[:8]}-{datetime.now().strftime('%Y%m%d%H%M%S')}"
+    execution_name = f"{scenario_name.replace('_', '-')}-{_EXECUTION_NAME_PREFIX}-{next(_EXECUTION_COUNTER):06d}"
 
     try:
-        start_response = stepfunctions_client.start_execution(
+        if wait and _STATE_MACHINE_TYPES.get(state_machine_arn) == 'EXPRESS':
+            # Express workflows can run synchronously: one blocking call instead of polling.
+            log_message(f"ID da Execução do Teste: {test_run_id}")
+            log_message("State Machine do tipo EXPRESS: executando de forma síncrona...")
+            sync_response = _sfn_sync_client().start_sync_execution(
+                stateMachineArn=state_machine_arn,
+                input=_json_dumps_compact(sfn_input),
+                name=execution_name
+            )
+            return _report_execution_result(sync_response['executionArn'], scenario_name, sync_response, test_scenario_config, analysis_enabled, analysis_provider)
+
+        start_response = _sfn_client().start_execution(
             stateMachineArn=state_machine_arn,
-            input=json.dumps(sfn_input),
+            input=_json_dumps_compact(sfn_input),
             name=execution_name
         )
         execution_arn = start_response['executionArn']
@@ -211,19 +890,22 @@ def _run_single_test(state_machine_arn: str, scenario_path: Path, wait: bool, an
         log_message(f"Link para o console AWS: https://console.aws.amazon.com/states/home?#/executions/details/{execution_arn}")
 
         if wait:
-            return monitor_sfn_execution(execution_arn, scenario_name, test_scenario_config, analysis_enabled, analysis_provider)
+            return monitor_sfn_execution(execution_arn, scenario_name, test_scenario_config, analysis_enabled, analysis_provider, show_spinner, poller)
         else:
             log_message("Teste iniciado em modo 'no-wait'. A CLI não acompanhará a execução.")
             return True
 
     except ClientError as e:
+        if e.response['Error']['Code'] in ('StateMachineDoesNotExist', 'AccessDeniedException', 'AccessDenied'):
+            # The cached ARN may be stale (deleted, or from another account); look it up again next run.
+            _invalidate_disk_cached_state_machine(state_machine_arn)
         log_message(f"Erro AWS ao iniciar execução da Step Functions: {e}", level="ERROR", err=True)
         return False
     except Exception as e:
         log_message(f"Erro inesperado ao executar teste: {e}", level="ERROR", err=True)
         return False
 
-def _run_and_summarize_tests(test_jobs: List[Dict], parallel: bool, wait: bool, analysis_enabled: bool, analysis_provider: str):
+def _run_and_summarize_tests(test_jobs: List[Dict], parallel: bool, wait: bool, analysis_enabled: bool, analysis_provider: str, max_workers: int = MAX_PARALLEL_TESTS):
     """Dispatches test jobs for execution, either sequentially or in parallel, and summarizes results."""
     results = {'passed': 0, 'failed': 0}
     
@@ -235,7 +917,9 @@ def _run_and_summarize_tests(test_jobs: List[Dict], parallel: bool, wait: bool,
 
     if parallel:
         log_message("Executando testes em modo PARALELO.", level="INFO")
-        with ThreadPoolExecutor() as executor:
+        # One shared poller instead of every worker polling its own execution.
+        poller = _ExecutionPoller() if wait else None
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(test_jobs)), thread_name_prefix="sfn") as executor:
             future_to_job = {
                 executor.submit(
                     _run_single_test, 
@@ -243,11 +927,15 @@ def _run_and_summarize_tests(test_jobs: List[Dict], parallel: bool, wait: bool,
                     job['scenario_path'], 
                     wait,
                     analysis_enabled,
-                    analysis_provider
+                    analysis_provider,
+                    # Per-test spinners would fight over the same terminal line.
+                    show_spinner=False,
+                    poller=poller
                 ): job for job in test_jobs
             }
-            
-            for future in as_completed(future_to_job):
+
+            # Progress is reported only from this thread, one line per finished test.
+            for completed, future in enumerate(as_completed(future_to_job), start=1):
                 try:
                     is_pass = future.result()
                     if is_pass:
@@ -259,6 +947,9 @@ def _run_and_summarize_tests(test_jobs: List[Dict], parallel: bool, wait: bool,
                     scenario_name = job['scenario_path'].stem
                     log_message(f"Cenário '{scenario_name}' gerou uma exceção: {exc}", level="ERROR", err=True)
                     results['failed'] += 1
+                log_message(f"Progresso: {completed}/{len(test_jobs)} testes concluídos.")
+        if poller:
+            poller.close()
     else:
         log_message("Executando testes em modo SEQUENCIAL.", level="INFO")
         for job in test_jobs:
@@ -271,16 +962,19 @@ def _run_and_summarize_tests(test_jobs: List[Dict], parallel: bool, wait: bool,
     run_end_time = time.monotonic()
     total_duration = run_end_time - run_start_time
 
-    log_message(click.style("\n--- Resumo Final da Execução ---", fg='cyan', bold=True))
-    log_message(click.style(f"Testes Passaram: {results['passed']}", fg='green'))
-    log_message(click.style(f"Testes Falharam: {results['failed']}", fg='red'))
-    log_message(click.style(f"Tempo Total de Execução (CLI): {total_duration:.2f} segundos", bold=True))
-    log_message(click.style("--------------------------\n", fg='cyan', bold=True))
+    log_message(_SUMMARY_HEADER)
+    log_message(_style(f"Testes Passaram: {results['passed']}", fg='green'))
+    log_message(_style(f"Testes Falharam: {results['failed']}", fg='red'))
+    log_message(_style(f"Tempo Total de Execução (CLI): {total_duration:.2f} segundos", bold=True))
+    log_message(_SUMMARY_FOOTER)
+
+    # Failure analyses ran in the background while the remaining tests executed.
+    _report_pending_analyses()
 
     if results['failed'] > 0:
         sys.exit(1)
 
-def _run_interactive_mode(wait: bool, parallel: bool, analysis_enabled: bool, analysis_provider: str):
+def _run_interactive_mode(wait: bool, parallel: bool, analysis_enabled: bool, analysis_provider: str, max_parallel: int = MAX_PARALLEL_TESTS):
     """Guides the user through an interactive session to select suites and scenarios."""
     if not questionary:
         log_message("Erro: O modo interativo requer a biblioteca 'questionary'.", level="ERROR", err=True)
@@ -288,7 +982,7 @@ def _run_interactive_mode(wait: bool, parallel: bool, analysis_enabled: bool, an
         sys.exit(1)
 
     root_path = Path(TEST_SUITES_DIR)
-    available_suites = [d for d in root_path.iterdir() if d.is_dir()]
+    available_suites = _list_suite_dirs(root_path)
     if not available_suites:
         log_message("Nenhuma suíte de teste encontrada no diretório 'tests'.", level="WARNING")
         return
@@ -296,18 +990,23 @@ def _run_interactive_mode(wait: bool, parallel: bool, analysis_enabled: bool, an
     try:
         selected_suite_names = questionary.checkbox(
             'Selecione as suítes de teste que deseja executar (use a barra de espaço):',
-            choices=sorted([s.name for s in available_suites])
+            choices=[s.name for s in available_suites]
         ).ask()
 
         if not selected_suite_names:
             log_message("Nenhuma suíte selecionada. Encerrando.", level="INFO")
             return
 
+        # Build the clients here, so a setup failure exits before the lookup threads start.
+        _sfn_client()
+        _sts_client()
+        state_machine_arns = _resolve_arns(selected_suite_names)
+
         test_jobs = []
         skipped_suites = 0
         for suite_name in selected_suite_names:
             suite_path = root_path / suite_name
-            state_machine_arn = find_state_machine_arn(suite_name)
+            state_machine_arn = state_machine_arns[suite_name]
             if not state_machine_arn:
                 log_message(f"Pulando suíte '{suite_name}' pois a State Machine não foi encontrada.", level="WARNING")
                 skipped_suites += 1
@@ -318,7 +1017,8 @@ def _run_interactive_mode(wait: bool, parallel: bool, analysis_enabled: bool, an
                 log_message(f"Aviso: Nenhuma pasta 'cases' encontrada para a suíte '{suite_name}'.", level="WARNING")
                 continue
 
-            scenarios = sorted([f.stem for f in cases_dir.glob("*.json")])
+            scenario_paths = dict(_list_scenario_files(cases_dir))
+            scenarios = list(scenario_paths)
             if not scenarios:
                 log_message(f"Aviso: Nenhum cenário encontrado para a suíte '{suite_name}'.", level="WARNING")
                 continue
@@ -339,13 +1039,13 @@ def _run_interactive_mode(wait: bool, parallel: bool, analysis_enabled: bool, an
             for scenario_name in scenarios_to_run:
                 test_jobs.append({
                     'state_machine_arn': state_machine_arn,
-                    'scenario_path': cases_dir / f"{scenario_name}.json",
+                    'scenario_path': scenario_paths[scenario_name],
                 })
         
         if skipped_suites > 0:
             log_message(f"{skipped_suites} suíte(s) pulada(s) por não encontrar a SFN correspondente.")
 
-        _run_and_summarize_tests(test_jobs, parallel, wait, analysis_enabled, analysis_provider)
+        _run_and_summarize_tests(test_jobs, parallel, wait, analysis_enabled, analysis_provider, max_parallel)
 
     except (KeyboardInterrupt, TypeError):
         log_message("\nOperação cancelada pelo usuário.", level="INFO")
@@ -364,10 +1064,11 @@ def cli():
 @click.option('--scenario', '-s', 'scenarios_to_run', multiple=True, help='Executa cenários específicos pelo nome (sem a extensão .json).')
 @click.option('--interactive', '-i', is_flag=True, help='Inicia a CLI em modo interativo para selecionar suítes e cenários.')
 @click.option('--parallel', is_flag=True, help='Executa os testes em paralelo para maior velocidade.')
+@click.option('--max-parallel', type=click.IntRange(min=1), default=MAX_PARALLEL_TESTS, show_default=True, help='Número máximo de testes simultâneos no modo --parallel.')
 @click.option('--analyze-failures', 'analysis_enabled', is_flag=True, help='Ativa a IA para analisar e sugerir correções para testes que falham.')
-@click.option('--provider', 'analysis_provider', default=None, help='Provedor de IA a ser usado para geração ou análise (ex: openai, gemini, groq).')
+@click.option('--provider', 'analysis_provider', default=None, help='Provedor de IA a ser usado para geração ou análise (ex: openai, gemini, groq, bedrock).')
 @click.option('--wait/--no-wait', default=True, help='Espera a conclusão do teste e mostra o resultado. Padrão: --wait.')
-def run(suites_to_run: Tuple[str], scenarios_to_run: Tuple[str], wait: bool, interactive: bool, parallel: bool, analysis_enabled: bool, analysis_provider: str):
+def run(suites_to_run: Tuple[str], scenarios_to_run: Tuple[str], wait: bool, interactive: bool, parallel: bool, max_parallel: int, analysis_enabled: bool, analysis_provider: str):
     """
     Executa suítes de teste E2E a partir do diretório 'tests'.
 
@@ -380,9 +1081,16 @@ def run(suites_to_run: Tuple[str], scenarios_to_run: Tuple[str], wait: bool, int
 
     - Executar uma suíte específica em paralelo:
       python cli.py run ProcessOrderFlow --parallel
+
+    - Limitar a quantidade de testes simultâneos:
+      python cli.py run --parallel --max-parallel 8
     """
+    if parallel:
+        # Must run before the first client is built; the pool size is fixed at creation.
+        _size_aws_client_pool(max_parallel)
+
     if interactive:
-        _run_interactive_mode(wait, parallel, analysis_enabled, analysis_provider)
+        _run_interactive_mode(wait, parallel, analysis_enabled, analysis_provider, max_parallel)
         return
 
     root_path = Path(TEST_SUITES_DIR)
@@ -392,7 +1100,7 @@ def run(suites_to_run: Tuple[str], scenarios_to_run: Tuple[str], wait: bool, int
 
     suite_paths_to_run = []
     if not suites_to_run:
-        suite_paths_to_run = [d for d in root_path.iterdir() if d.is_dir()]
+        suite_paths_to_run = _list_suite_dirs(root_path)
     else:
         for suite_name in suites_to_run:
             suite_path = root_path / suite_name
@@ -405,11 +1113,16 @@ def run(suites_to_run: Tuple[str], scenarios_to_run: Tuple[str], wait: bool, int
         log_message("Nenhuma suíte de teste válida para executar.", level="WARNING")
         return
 
+    # Build the clients here, so a setup failure exits before the lookup threads start.
+    _sfn_client()
+    _sts_client()
+
+    state_machine_arns = _resolve_arns([suite_path.name for suite_path in suite_paths_to_run])
+
     test_jobs = []
     skipped_suites = 0
     for suite_path in suite_paths_to_run:
-        state_machine_name = suite_path.name
-        state_machine_arn = find_state_machine_arn(state_machine_name)
+        state_machine_arn = state_machine_arns[suite_path.name]
         if not state_machine_arn:
             log_message(f"Pulando suíte '{suite_path.name}' pois a SFN não foi encontrada.", level="WARNING")
             skipped_suites += 1
@@ -420,17 +1133,18 @@ def run(suites_to_run: Tuple[str], scenarios_to_run: Tuple[str], wait: bool, int
             log_message(f"Aviso: Nenhuma pasta 'cases' encontrada para a suíte '{suite_path.name}'.", level="WARNING")
             continue
 
-        scenarios_in_dir = cases_dir.glob("*.json")
+        # One directory listing per suite; requested scenario names are resolved against it.
+        available_scenarios = dict(_list_scenario_files(cases_dir))
         scenarios_to_execute_paths = []
         if scenarios_to_run:
             for s_name in scenarios_to_run:
-                path = cases_dir / f"{s_name}.json"
-                if path.exists():
+                path = available_scenarios.get(s_name)
+                if path:
                     scenarios_to_execute_paths.append(path)
                 else:
                      log_message(f"Aviso: Cenário '{s_name}' não encontrado em '{cases_dir}'.", level="WARNING")
         else:
-            scenarios_to_execute_paths = sorted(list(scenarios_in_dir))
+            scenarios_to_execute_paths = list(available_scenarios.values())
 
         for s_path in scenarios_to_execute_paths:
             test_jobs.append({
@@ -441,7 +1155,7 @@ def run(suites_to_run: Tuple[str], scenarios_to_run: Tuple[str], wait: bool, int
     if skipped_suites > 0:
         log_message(f"{skipped_suites} suíte(s) pulada(s) por não encontrar a SFN correspondente.")
 
-    _run_and_summarize_tests(test_jobs, parallel, wait, analysis_enabled, analysis_provider)
+    _run_and_summarize_tests(test_jobs, parallel, wait, analysis_enabled, analysis_provider, max_parallel)
 
 
 @cli.command(name="list")
@@ -454,16 +1168,15 @@ def list_scenarios():
         return
 
     found_any = False
-    suites = sorted([d for d in root_path.iterdir() if d.is_dir()])
-    for suite_path in suites:
+    for suite_path in _list_suite_dirs(root_path):
         target_sfn = suite_path.name
         
         cases_dir = suite_path / "cases"
         if cases_dir.is_dir():
-            scenarios = sorted([f.stem for f in cases_dir.glob("*.json")])
+            scenarios = [name for name, _ in _list_scenario_files(cases_dir)]
             if scenarios:
                 found_any = True
-                click.echo(click.style(f"Suite: {suite_path.name}", fg='yellow') + f" (Alvo SFN: {target_sfn})")
+                click.echo(_style(f"Suite: {suite_path.name}", fg='yellow') + f" (Alvo SFN: {target_sfn})")
                 for scenario_name in scenarios:
                     click.echo(f"  - {scenario_name}")
 
@@ -473,22 +1186,112 @@ def list_scenarios():
 
 # --- AI-Powered Generation & Analysis ---
 
+# Prompt templates, compiled once per process by _prompt_template().
+_FAILURE_ANALYSIS_TEMPLATE = """
+Você é um engenheiro de software sênior e especialista em AWS. Sua tarefa é analisar a falha de um teste E2E de uma Step Function.
+
+**Contexto do Teste:**
+Um teste automatizado foi executado com o seguinte input e expectativas:
+
+- **Input Enviado:**
+```json
+{scenario_input}
+```
+
+- **Resultado Esperado:**
+```json
+{expected_result}
+```
+
+**Resultado da Falha:**
+O teste falhou com os seguintes detalhes da execução na AWS:
+
+- **Tipo de Erro:** {actual_error}
+- **Causa da Falha:**
+```
+{actual_cause}
+```
+
+**Sua Análise:**
+Com base nos dados acima, forneça uma análise concisa da falha.
+
+1.  **Diagnóstico Provável:** Qual a causa raiz mais provável do problema? Seja direto e técnico.
+2.  **Pontos de Verificação:** Quais são os 2 ou 3 pontos principais que o desenvolvedor deve investigar para corrigir o problema? (ex: "Verificar a permissão (IAM Role) da Lambda X", "Analisar os logs da Lambda Y em busca do erro Z", "Confirmar se o formato do evento para o EventBridge está correto").
+3.  **Possível Solução:** Se a causa for óbvia, sugira uma possível solução ou um trecho de código para correção.
+
+Seja claro, objetivo e forneça insights práticos para acelerar a depuração.
+"""
+
+_SCENARIO_GENERATION_TEMPLATE = """
+Você é um especialista em testes de software (QA) criando cenários de teste para um sistema na AWS.
+Com base no contexto do projeto fornecido abaixo, gere uma lista de cenários de teste com a máxima cobertura.
+
+Contexto do Projeto:
+{contexto}
+
+Cada cenário deve ser um objeto JSON completo com as seguintes chaves:
+- "description": uma string clara e concisa descrevendo o objetivo do teste.
+- "input": um objeto JSON que será o input para a Step Function alvo da suíte de teste.
+- "expected": (Opcional) um objeto JSON representando o output esperado se o teste for bem-sucedido.
+- "error": (Opcional) um objeto JSON com as chaves "Error" e "Cause" se o teste espera uma falha.
+
+Sua resposta DEVE ser um único e válido array JSON. NÃO inclua nenhum texto antes ou depois do array.
+"""
+
+@functools.lru_cache(maxsize=None)
+def _prompt_template(template: str):
+    """Compila um template de prompt do LangChain uma única vez por processo."""
+    from langchain_core.prompts import PromptTemplate
+    return PromptTemplate.from_template(template)
+
+# LangChain integration per provider: (module, class, pip package). Only the selected one is imported.
+_LLM_PROVIDER_CLASSES = {
+    'openai': ('langchain_openai', 'ChatOpenAI', 'langchain-openai'),
+    'gemini': ('langchain_google_genai', 'GoogleGenerativeAI', 'langchain-google-genai'),
+    'groq': ('langchain_groq', 'ChatGroq', 'langchain-groq'),
+    'claude': ('langchain_anthropic', 'ChatAnthropic', 'langchain-anthropic'),
+    'bedrock': ('langchain_aws', 'ChatBedrockConverse', 'langchain-aws'),
+}
+
+@functools.lru_cache(maxsize=None)
+def _import_llm_class(provider_name: str):
+    """Importa a classe LangChain do provedor na primeira utilização; as seguintes reutilizam o cache."""
+    module_name, class_name, _ = _LLM_PROVIDER_CLASSES[provider_name]
+    return getattr(importlib.import_module(module_name), class_name)
+
+# LLM instances by (provider, config), so repeated failure analyses reuse one client and its HTTP pool.
+_LLM_INSTANCES: Dict[Tuple[str, str], Any] = {}
+_LLM_INSTANCES_LOCK = threading.Lock()
+
 def _get_llm_instance(provider_name: str, config: Dict[str, Any]):
+    """Returns a LangChain LLM instance for the provider, building it on first use."""
+    cache_key = (provider_name, repr(sorted(config.items())))
+    with _LLM_INSTANCES_LOCK:
+        llm = _LLM_INSTANCES.get(cache_key)
+        if llm is None:
+            llm = _build_llm_instance(provider_name, config)
+            # Failures are not cached, so their error messages are shown on every attempt.
+            if llm is not None:
+                _LLM_INSTANCES[cache_key] = llm
+    return llm
+
+def _build_llm_instance(provider_name: str, config: Dict[str, Any]):
     """Initializes and returns a LangChain LLM instance based on the provider."""
+    provider_name = provider_name or config.get('provider')
+    if provider_name not in _LLM_PROVIDER_CLASSES:
+        log_message(f"Erro: Provedor de IA '{provider_name}' não é suportado.", level="ERROR", err=True)
+        return None
+
     try:
-        from langchain_openai import ChatOpenAI
-        from langchain_google_genai import GoogleGenerativeAI
-        from langchain_groq import ChatGroq
-        from langchain_anthropic import ChatAnthropic
+        llm_class = _import_llm_class(provider_name)
     except ImportError:
         log_message(
             "Erro: Para usar a funcionalidade de IA, instale as dependências:\n"
-            "pip install pyyaml langchain langchain-openai langchain-google-genai langchain-groq langchain-anthropic python-dotenv",
+            f"pip install pyyaml langchain {_LLM_PROVIDER_CLASSES[provider_name][2]} python-dotenv",
             level="ERROR", err=True
         )
         return None
 
-    provider_name = provider_name or config.get('provider')
     log_message(f"Usando provedor de IA: {provider_name}")
 
     if provider_name == 'openai':
@@ -496,14 +1299,14 @@ def _get_llm_instance(provider_name: str, config: Dict[str, Any]):
         if not api_key:
             log_message("Erro: Chave de API da OpenAI não encontrada. Defina em 'config.yaml' ou na variável de ambiente OPENAI_API_KEY.", level="ERROR", err=True)
             return None
-        return ChatOpenAI(model="gpt-5", temperature=0.2, max_tokens=16000, api_key=api_key)
+        return llm_class(model="gpt-5", temperature=0.2, max_tokens=16000, api_key=api_key)
 
     elif provider_name == 'gemini':
         api_key = config.get('api_key') or os.getenv('GOOGLE_API_KEY')
         if not api_key:
             log_message("Erro: Chave de API do Google não encontrada. Defina em 'config.yaml' ou na variável de ambiente GOOGLE_API_KEY.", level="ERROR", err=True)
             return None
-        return GoogleGenerativeAI(model="gemini-2.5-pro", google_api_key=api_key, temperature=0.2)
+        return llm_class(model="gemini-2.5-pro", google_api_key=api_key, temperature=0.2)
 
     elif provider_name == 'groq':
         api_key = config.get('api_key') or os.getenv('GROQ_API_KEY')
@@ -511,7 +1314,7 @@ def _get_llm_instance(provider_name: str, config: Dict[str, Any]):
             log_message("Erro: Chave de API da Groq não encontrada. Defina em 'config.yaml' ou na variável de ambiente GROQ_API_KEY.", level="ERROR", err=True)
             return None
         model_name = config.get('model_name', "llama3-8b-8192")
-        return ChatGroq(temperature=0, model_name=model_name, groq_api_key=api_key)
+        return llm_class(temperature=0, model_name=model_name, groq_api_key=api_key)
 
     elif provider_name == 'claude':
         api_key = config.get('api_key') or os.getenv('ANTHROPIC_API_KEY')
@@ -519,93 +1322,109 @@ def _get_llm_instance(provider_name: str, config: Dict[str, Any]):
             log_message("Erro: Chave de API da Anthropic não encontrada. Defina em 'config.yaml' ou na variável de ambiente ANTHROPIC_API_KEY.", level="ERROR", err=True)
             return None
         model_name = config.get('model_name', "claude-3-sonnet-20240229")
-        return ChatAnthropic(model=model_name, anthropic_api_key=api_key)
-    
-    else:
-        log_message(f"Erro: Provedor de IA '{provider_name}' não é suportado.", level="ERROR", err=True)
-        return None
-
-def _invoke_ai_analysis(scenario_config: Dict, execution_details: Dict, provider: str):
-    """Analyzes a failed test run using an AI."""
-    log_message(click.style("--- Análise de Falha por IA Ativada ---", fg='magenta', bold=True))
-    
-    config = load_ai_config(provider)
-    if not config:
-        log_message("Não foi possível carregar a configuração de IA para análise. Pulando.", level="WARNING")
-        return
-
-    provider_name = provider or config.get('default_provider')
-    provider_config = config.get('providers', {}).get(provider_name, {})
-    llm = _get_llm_instance(provider_name, provider_config)
-
-    if not llm:
-        log_message("Não foi possível inicializar o modelo de IA para análise. Pulando.", level="WARNING")
-        return
-
-    from langchain_core.prompts import PromptTemplate
-
-    prompt = PromptTemplate(
-        input_variables=["scenario_input", "expected_result", "actual_error", "actual_cause"],
-        template="""
-Você é um engenheiro de software sênior e especialista em AWS. Sua tarefa é analisar a falha de um teste E2E de uma Step Function.
-
-**Contexto do Teste:**
-Um teste automatizado foi executado com o seguinte input e expectativas:
-
-- **Input Enviado:**
-```json
-{scenario_input}
-```
-
-- **Resultado Esperado:**
-```json
-{expected_result}
-```
-
-**Resultado da Falha:**
-O teste falhou com os seguintes detalhes da execução na AWS:
+        return llm_class(model=model_name, anthropic_api_key=api_key)
+
+    elif provider_name == 'bedrock':
+        # Uses the regular AWS credential chain, like the Step Functions clients.
+        model_name = config.get('model_name', "us.anthropic.claude-3-5-haiku-20241022-v1:0")
+        bedrock_kwargs = {'model': model_name, 'temperature': 0.2}
+        if config.get('region_name'):
+            bedrock_kwargs['region_name'] = config['region_name']
+        # Latency-optimized inference is faster, but only a few models and regions accept it (opt-in).
+        if config.get('latency_optimized', False):
+            bedrock_kwargs['performance_config'] = {'latency': 'optimized'}
+        return llm_class(**bedrock_kwargs)
+
+def _chunk_text(chunk) -> str:
+    """Returns the text of an LLM result or streamed chunk: a str, or a message whose content is a str or a list of blocks."""
+    if isinstance(chunk, str):
+        return chunk
+    content = chunk.content
+    if isinstance(content, str):
+        return content
+    # Bedrock Converse (and Anthropic) stream content blocks like {"type": "text", "text": ...}.
+    return "".join(
+        block if isinstance(block, str) else block.get('text', '')
+        for block in content
+        if isinstance(block, str) or block.get('type') == 'text'
+    )
 
-- **Tipo de Erro:** {actual_error}
-- **Causa da Falha:**
-```
-{actual_cause}
-```
+def _stream_chain(chain, chain_input: Dict[str, Any]) -> str:
+    """Runs a LangChain chain, echoing tokens to stdout as they arrive, and returns the full text."""
+    pieces = []
+    for chunk in chain.stream(chain_input):
+        piece = _chunk_text(chunk)
+        pieces.append(piece)
+        # Written raw: log_message would put every token on its own line.
+        sys.stdout.write(piece)
+        sys.stdout.flush()
+    sys.stdout.write("\n")
+    return "".join(pieces)
+
+@functools.lru_cache(maxsize=None)
+def _analysis_pool() -> ThreadPoolExecutor:
+    """Returns the pool that runs failure analyses in the background, created on first use."""
+    return ThreadPoolExecutor(max_workers=AI_ANALYSIS_MAX_WORKERS, thread_name_prefix="ai")
+
+def _invoke_ai_analysis(scenario_name: str, scenario_config: Dict, execution_details: Dict, provider: str):
+    """Schedules an AI analysis of a failed test run; results are shown by _report_pending_analyses()."""
+    log_message(_style("--- Análise de Falha por IA Ativada ---", fg='magenta', bold=True))
+    log_message(_style("A IA está analisando a falha em segundo plano; o resultado será exibido ao final.", fg='magenta'))
+    future = _analysis_pool().submit(_analyze_failure, scenario_config, execution_details, provider)
+    with _PENDING_ANALYSES_LOCK:
+        _PENDING_ANALYSES.append((scenario_name, future))
+
+def _analyze_failure(scenario_config: Dict, execution_details: Dict, provider: str) -> str:
+    """Analyzes a failed test run using an AI; returns the analysis text, or None on failure."""
+    try:
+        config = load_ai_config(provider)
+        if not config:
+            log_message("Não foi possível carregar a configuração de IA para análise. Pulando.", level="WARNING")
+            return None
 
-**Sua Análise:**
-Com base nos dados acima, forneça uma análise concisa da falha.
+        provider_name = provider or config.get('default_provider')
+        provider_config = config.get('providers', {}).get(provider_name, {})
+        llm = _get_llm_instance(provider_name, provider_config)
 
-1.  **Diagnóstico Provável:** Qual a causa raiz mais provável do problema? Seja direto e técnico.
-2.  **Pontos de Verificação:** Quais são os 2 ou 3 pontos principais que o desenvolvedor deve investigar para corrigir o problema? (ex: "Verificar a permissão (IAM Role) da Lambda X", "Analisar os logs da Lambda Y em busca do erro Z", "Confirmar se o formato do evento para o EventBridge está correto").
-3.  **Possível Solução:** Se a causa for óbvia, sugira uma possível solução ou um trecho de código para correção.
+        if not llm:
+            log_message("Não foi possível inicializar o modelo de IA para análise. Pulando.", level="WARNING")
+            return None
 
-Seja claro, objetivo e forneça insights práticos para acelerar a depuração.
-"""
-    )
+        prompt = _prompt_template(_FAILURE_ANALYSIS_TEMPLATE)
 
-    scenario_input = json.dumps(scenario_config, indent=2)
-    expected_result = "Sucesso com output específico" if "expected" in scenario_config else f"Falha controlada com erro '{scenario_config.get('error', {}).get('Error')}'"
-    actual_error = execution_details.get('error', 'N/A')
-    actual_cause = execution_details.get('cause', 'N/A')
+        scenario_input = _json_dumps_pretty(scenario_config)
+        expected_result = "Sucesso com output específico" if "expected" in scenario_config else f"Falha controlada com erro '{scenario_config.get('error', {}).get('Error')}'"
+        actual_error = execution_details.get('error', 'N/A')
+        actual_cause = execution_details.get('cause', 'N/A')
 
-    chain = prompt | llm
-    
-    log_message(click.style("A IA está analisando a falha...", fg='magenta'))
-    try:
+        chain = prompt | llm
         response = chain.invoke({
             "scenario_input": scenario_input,
             "expected_result": expected_result,
             "actual_error": actual_error,
             "actual_cause": actual_cause
         })
-        
-        response_content = response if isinstance(response, str) else response.content
-        
-        log_message(click.style("--- Análise da IA ---", fg='magenta', bold=True))
-        log_message(response_content)
-        log_message(click.style("---------------------", fg='magenta', bold=True))
+        return _chunk_text(response)
 
     except Exception as e:
         log_message(f"Erro ao invocar a IA para análise: {e}", level="ERROR", err=True)
+        return None
+    finally:
+        _flush_log()
+
+def _report_pending_analyses():
+    """Waits for the background failure analyses and prints them in the order they were requested."""
+    with _PENDING_ANALYSES_LOCK:
+        pending = list(_PENDING_ANALYSES)
+        _PENDING_ANALYSES.clear()
+    for scenario_name, future in pending:
+        response_content = future.result()
+        if response_content is None:
+            continue
+        log_message(_AI_ANALYSIS_HEADER)
+        log_message(_style(f"Cenário: {scenario_name}", bold=True))
+        log_message(response_content)
+        log_message(_AI_ANALYSIS_FOOTER)
 
 
 def load_ai_config(provider_name: str = None):
@@ -615,9 +1434,10 @@ def load_ai_config(provider_name: str = None):
         log_message(f"Aviso: Arquivo de configuração '{CONFIG_FILE}' não encontrado. Usando apenas variáveis de ambiente para OpenAI.", level="WARNING")
         return {"provider": provider_name or "openai", "providers": {}}
 
-    with open(config_path, 'r', encoding='utf-8') as f:
+    with open(config_path, 'rb') as f:
         try:
-            config = yaml.safe_load(f)
+            # The loader decodes the bytes itself (UTF-8 by default).
+            config = yaml.load(f.read(), Loader=YamlSafeLoader)
         except yaml.YAMLError as e:
             log_message(f"Erro ao ler o arquivo de configuração '{CONFIG_FILE}': {e}", level="ERROR", err=True)
             return None
@@ -640,11 +1460,8 @@ def _select_context_files(project_path: str) -> List[Path]:
         sys.exit(1)
 
     p_path = Path(project_path)
-    # List all files, ignoring common noise like .git, __pycache__, etc.
-    all_files = [
-        f.relative_to(p_path) for f in p_path.rglob('*') 
-        if f.is_file() and not any(part in f.parts for part in ['.git', '__pycache__', 'node_modules', '.venv'])
-    ]
+    # List all files, ignoring common noise like .git, __pycache__, etc. (pruned during the walk).
+    all_files = [Path(os.path.relpath(entry.path, project_path)) for entry in _iter_project_files(project_path)]
     
     # Sort files to ensure consistent ordering
     all_files.sort()
@@ -664,8 +1481,136 @@ def _select_context_files(project_path: str) -> List[Path]:
         log_message("\nSeleção de contexto cancelada.", level="INFO")
         return []
 
-def scenarios_generate(projeto_path: str, provider: str = None, interactive: bool = False):
-    """Gera cenários de teste com IA usando LangChain."""
+def _context_cache_path(project_path: str) -> Path:
+    """Arquivo do cache de contexto de um projeto (um por caminho absoluto)."""
+    project_key = hashlib.sha1(os.path.abspath(project_path).encode('utf-8')).hexdigest()
+    return CONTEXT_CACHE_DIR / f"{project_key}.json"
+
+def _load_context_cache(project_path: str) -> Dict[str, list]:
+    """Carrega o cache {caminho: [mtime_ns, tamanho, início]} das leituras anteriores do projeto."""
+    try:
+        return _json_loads(_context_cache_path(project_path).read_bytes())
+    except (OSError, ValueError):
+        return {}
+
+def _is_sensitive_context_file(file_path: Path) -> bool:
+    """Indica se o início do arquivo não deve ser gravado no cache de contexto (config da CLI ou possível segredo)."""
+    return file_path.name == CONFIG_FILE or bool(_CONTEXT_CACHE_SENSITIVE_RE.search(file_path.name))
+
+def _save_context_cache(project_path: str, head_cache: Dict[str, list]):
+    """Grava o cache de contexto de forma atômica, legível apenas pelo usuário (0600)."""
+    cache_path = _context_cache_path(project_path)
+    try:
+        cache_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix('.tmp')
+        # Created with 0600 from the start, so the heads are never readable by other users.
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o600)
+        with os.fdopen(fd, 'wb') as tmp_file:
+            tmp_file.write(_json_dumps_compact(head_cache).encode('utf-8'))
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        log_message(f"Não foi possível gravar o cache de contexto: {e}", level="WARNING", console=False)
+
+def _plan_context_files(project_path: str, file_paths: List[Path]) -> List[Tuple[Path, os.stat_result]]:
+    """Escolhe, em ordem, os arquivos de contexto que cabem no orçamento de tamanho, antes de qualquer leitura."""
+    planned = []
+    budget_used = 0
+    for file_path in file_paths:
+        try:
+            st = file_path.stat()
+        except OSError as e:
+            log_message(f"Não foi possível ler o arquivo {file_path}: {e}", level="WARNING")
+            continue
+        if st.st_size > CONTEXT_MAX_FILE_BYTES:
+            log_message(f"Arquivo ignorado por ser muito grande: {file_path}", level="WARNING")
+            continue
+        # A UTF-8 file never decodes to more characters than bytes, so this bounds the head plus its header.
+        entry_chars = min(st.st_size, CONTEXT_FILE_HEAD_CHARS) + len(f"--- File: {file_path.relative_to(project_path)} ---\n\n\n")
+        if budget_used + entry_chars > CONTEXT_MAX_TOTAL_CHARS:
+            log_message("Limite de tamanho do contexto atingido. Os arquivos restantes foram ignorados.", level="WARNING")
+            break
+        budget_used += entry_chars
+        planned.append((file_path, st))
+    return planned
+
+def _read_context_head(file_path: Path, st: os.stat_result, cached_heads: Dict[str, list] = None, read_heads: Dict[str, list] = None) -> str:
+    """Lê o início de um arquivo de contexto já planejado (com seu stat); retorna None se ele for ilegível.
+
+    Se o arquivo não mudou (mesmo mtime e tamanho) desde a última execução, usa o início em 'cached_heads';
+    cada início obtido é registrado em 'read_heads'.
+    """
+    try:
+        key = str(file_path)
+        # Sensitive files are read fresh every time and never recorded in the cache.
+        sensitive = _is_sensitive_context_file(file_path)
+        entry = cached_heads.get(key) if cached_heads and not sensitive else None
+        if entry and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+            head = entry[2]
+        else:
+            with open(file_path, 'r', encoding='utf-8', errors='ignore') as file_content:
+                head = file_content.read(CONTEXT_FILE_HEAD_CHARS)
+        if read_heads is not None and not sensitive:
+            # Reader threads write distinct keys, which is safe on a shared dict.
+            read_heads[key] = [st.st_mtime_ns, st.st_size, head]
+        return head
+    except OSError as e:
+        log_message(f"Não foi possível ler o arquivo {file_path}: {e}", level="WARNING")
+        return None
+
+def _iter_project_files(project_path: str):
+    """Percorre o projeto e gera os DirEntry de todos os arquivos fora dos diretórios excluídos."""
+    # Iterative os.scandir walk: excluded directories are pruned before descending,
+    # and DirEntry type checks avoid an extra stat() per entry.
+    pending_dirs = [project_path]
+    while pending_dirs:
+        dir_path = pending_dirs.pop()
+        try:
+            entries = os.scandir(dir_path)
+        except OSError as e:
+            # Unreadable (or just deleted) directories are skipped, like os.walk does.
+            log_message(f"Diretório ignorado por não poder ser lido: {dir_path} ({e})", level="WARNING")
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in CONTEXT_EXCLUDED_DIRS:
+                        pending_dirs.append(entry.path)
+                elif entry.is_file():
+                    yield entry
+
+def _find_context_files(project_path: str) -> List[Path]:
+    """Percorre o projeto e retorna os arquivos relevantes para o contexto da IA."""
+    return sorted(
+        Path(entry.path) for entry in _iter_project_files(project_path)
+        if os.path.splitext(entry.name)[1] in CONTEXT_FILE_EXTENSIONS or entry.name in CONTEXT_FILE_NAMES
+    )
+
+def _load_cached_scenarios(cache_path: Path):
+    """Retorna os cenários gerados anteriormente para esta chave, se ainda estiverem válidos."""
+    try:
+        if time.time() - cache_path.stat().st_mtime > SCENARIO_CACHE_TTL:
+            return None
+        # Stdlib json both ways, like the SFN cache: generated scenarios may hold integers beyond
+        # 64 bits (boundary tests), which orjson cannot write and would read back as floats.
+        return json.loads(cache_path.read_bytes())
+    except (OSError, ValueError):
+        return None
+
+def _save_cached_scenarios(cache_path: Path, scenarios: List[Dict]):
+    """Grava os cenários gerados no cache em disco de forma atômica."""
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix('.tmp')
+        tmp_path.write_text(json.dumps(scenarios, ensure_ascii=False, separators=(',', ':')), encoding='utf-8')
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        log_message(f"Não foi possível gravar o cache de cenários: {e}", level="WARNING", console=False)
+
+def scenarios_generate(projeto_path: str, provider: str = None, interactive: bool = False, use_cache: bool = True):
+    """Gera cenários de teste com IA usando LangChain.
+
+    Com 'use_cache', uma resposta anterior para o mesmo provedor, modelo, prompt e contexto é reutilizada.
+    """
     config = load_ai_config(provider)
     if not config:
         return []
@@ -674,12 +1619,6 @@ def scenarios_generate(projeto_path: str, provider: str = None, interactive: boo
     provider_name = provider or config.get('default_provider')
     provider_config = config.get('providers', {}).get(provider_name, {})
 
-    llm = _get_llm_instance(provider_name, provider_config)
-    if not llm:
-        return []
-
-    from langchain_core.prompts import PromptTemplate
-    
     file_paths_for_context = []
     if interactive:
         file_paths_for_context = _select_context_files(projeto_path)
@@ -688,62 +1627,75 @@ def scenarios_generate(projeto_path: str, provider: str = None, interactive: boo
             return []
     else:
         # Default behavior: grab all relevant files
-        for root, _, files in os.walk(projeto_path):
-            # Exclude common noise directories
-            if any(part in root for part in ['.git', '__pycache__', 'node_modules', '.venv']):
-                continue
-            for f in files:
-                if f.endswith(('.py', '.yaml', '.yml', '.json', '.ts', '.js', 'requirements.txt', 'package.json', 'Dockerfile', '.md')):
-                    file_paths_for_context.append(Path(root) / f)
+        file_paths_for_context = _find_context_files(projeto_path)
 
-    context_parts = []
+    context_buffer = io.StringIO()
     log_message("Construindo contexto com os seguintes arquivos:")
-    for file_path in file_paths_for_context:
-        try:
+    # Unchanged files are served from the previous run's heads; only the rest are read.
+    cached_heads = _load_context_cache(projeto_path)
+    read_heads: Dict[str, list] = {}
+    read_head = functools.partial(_read_context_head, cached_heads=cached_heads, read_heads=read_heads)
+    # The budget is applied from stat() sizes first, so files past it are never read.
+    planned_files = _plan_context_files(projeto_path, file_paths_for_context)
+    # Reads are I/O-bound, so fetch the file heads concurrently; map() keeps the order.
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        heads = executor.map(read_head, [path for path, _ in planned_files], [st for _, st in planned_files])
+        for (file_path, _), head in zip(planned_files, heads):
+            if head is None:
+                continue
             relative_path = file_path.relative_to(projeto_path)
             log_message(f"  - {relative_path}")
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as file_content:
-                context_parts.append(f"--- File: {relative_path} ---\n{file_content.read(4000)}\n") # Increased limit slightly
-        except Exception as e:
-            log_message(f"Não foi possível ler o arquivo {file_path}: {e}", level="WARNING")
-            
-    context = "\n".join(context_parts)
+            context_buffer.write(f"--- File: {relative_path} ---\n")
+            context_buffer.write(head)
+            context_buffer.write("\n\n")
+
+    context = context_buffer.getvalue()
+    # Only files seen in this run are kept, so deleted files drop out of the cache.
+    if read_heads != cached_heads:
+        _save_context_cache(projeto_path, read_heads)
     
-    prompt = PromptTemplate(
-        input_variables=["contexto"],
-        template="""
-Você é um especialista em testes de software (QA) criando cenários de teste para um sistema na AWS.
-Com base no contexto do projeto fornecido abaixo, gere uma lista de cenários de teste com a máxima cobertura.
-
-Contexto do Projeto:
-{contexto}
-
-Cada cenário deve ser um objeto JSON completo com as seguintes chaves:
-- "description": uma string clara e concisa descrevendo o objetivo do teste.
-- "input": um objeto JSON que será o input para a Step Function alvo da suíte de teste.
-- "expected": (Opcional) um objeto JSON representando o output esperado se o teste for bem-sucedido.
-- "error": (Opcional) um objeto JSON com as chaves "Error" e "Cause" se o teste espera uma falha.
-
-Sua resposta DEVE ser um único e válido array JSON. NÃO inclua nenhum texto antes ou depois do array.
-"""
-    )
+    prompt = _prompt_template(_SCENARIO_GENERATION_TEMPLATE)
     
+    cache_key = hashlib.sha256("\0".join((
+        str(provider_name), str(provider_config.get('model_name', '')), prompt.template, context
+    )).encode('utf-8')).hexdigest()
+    cache_path = SCENARIO_CACHE_DIR / f"{cache_key}.json"
+    if use_cache:
+        cached_scenarios = _load_cached_scenarios(cache_path)
+        if cached_scenarios:
+            log_message(_style("Contexto inalterado: reutilizando cenários gerados anteriormente (use --no-cache para gerar novamente).", fg='magenta'))
+            return cached_scenarios
+
+    # Built only on a cache miss, so cached runs need neither the provider package nor an API key.
+    llm = _get_llm_instance(provider_name, provider_config)
+    if not llm:
+        return []
+
     chain = prompt | llm
-    log_message(click.style("Enviando requisição para a IA para gerar cenários...", fg='magenta'))
-    response = chain.invoke({"contexto": context})
-    print(response)
-    response_content = response if isinstance(response, str) else response.content
+    log_message(_style("Enviando requisição para a IA para gerar cenários...", fg='magenta'))
+    response_content = _stream_chain(chain, {"contexto": context})
     
     try:
-        # Robust JSON extraction
+        # Robust JSON extraction: decode the first array that parses, ignoring any text around it
+        # (markdown fences, commentary, a stray ']' afterwards).
         start_index = response_content.find('[')
-        end_index = response_content.rfind(']')
-        if start_index != -1 and end_index != -1 and end_index > start_index:
-            json_str = response_content[start_index : end_index + 1]
-            scenarios = json.loads(json_str)
-            if not isinstance(scenarios, list):
-                 raise json.JSONDecodeError("O JSON extraído não é uma lista.", json_str, 0)
+        found_empty_array = False
+        while start_index != -1:
+            try:
+                scenarios, _ = _JSON_DECODER.raw_decode(response_content, start_index)
+            except json.JSONDecodeError:
+                scenarios = None
+            # A '[' inside prose, or an inner list of a broken array, is not the scenario list.
+            # An empty '[]' (e.g. quoted in the commentary) is skipped too: a real list may follow.
+            if not isinstance(scenarios, list) or not scenarios or not all(isinstance(item, dict) for item in scenarios):
+                found_empty_array = found_empty_array or scenarios == []
+                start_index = response_content.find('[', start_index + 1)
+                continue
+            _save_cached_scenarios(cache_path, scenarios)
             return scenarios
+        if found_empty_array:
+            # Only empty arrays: the model answered, but generated no scenarios.
+            return []
         raise ValueError("Nenhum array JSON válido foi encontrado na resposta da IA.")
     except (json.JSONDecodeError, ValueError) as e:
         log_message("Falha ao extrair ou interpretar o JSON da resposta da IA.", level="ERROR", err=True)
@@ -753,9 +1705,10 @@ Sua resposta DEVE ser um único e válido array JSON. NÃO inclua nenhum texto a
 
 @cli.command()
 @click.argument('project_path', type=click.Path(exists=True, file_okay=False))
-@click.option('--provider', default=None, help='Provedor de IA a ser usado (ex: openai, gemini, groq).')
+@click.option('--provider', default=None, help='Provedor de IA a ser usado (ex: openai, gemini, groq, bedrock).')
 @click.option('--interactive', '-i', is_flag=True, help='Selecionar interativamente os arquivos de contexto para a IA.')
-def generate(project_path, provider, interactive):
+@click.option('--no-cache', 'no_cache', is_flag=True, help='Ignora cenários gerados anteriormente para o mesmo contexto e consulta a IA novamente.')
+def generate(project_path, provider, interactive, no_cache):
     """
     Gera cenários de teste para um projeto usando IA.
 
@@ -763,7 +1716,7 @@ def generate(project_path, provider, interactive):
     O nome do diretório será usado como o nome da State Machine alvo.
     """
     log_message(f"Gerando cenários para o projeto em '{project_path}'...")
-    scenarios = scenarios_generate(project_path, provider=provider, interactive=interactive)
+    scenarios = scenarios_generate(project_path, provider=provider, interactive=interactive, use_cache=not no_cache)
     if not scenarios:
         log_message("Nenhum cenário foi gerado.", level="WARNING")
         return
@@ -773,12 +1726,12 @@ def generate(project_path, provider, interactive):
     cases_dir = suite_dir / "cases"
     cases_dir.mkdir(parents=True, exist_ok=True)
 
-    log_message(click.style(f"\nCenários gerados para a suíte '{suite_name}':", bold=True))
+    log_message(_style(f"\nCenários gerados para a suíte '{suite_name}':", bold=True))
     for i, scenario_data in enumerate(scenarios):
         desc = scenario_data.get("description", f"cenario_{i+1}")
         # Sanitize description for use as a filename
         desc_slug = desc.lower().replace(" ", "_")
-        filename = "".join(c for c in desc_slug if c.isalnum() or c == '_')[:50] + ".json"
+        filename = _FILENAME_STRIP_RE.sub('', desc_slug)[:50] + ".json"
         filepath = cases_dir / filename
 
         # Prepare the final JSON content for the file
@@ -791,14 +1744,13 @@ def generate(project_path, provider, interactive):
         if "error" in scenario_data:
             file_content["error"] = scenario_data["error"]
 
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(file_content, f, indent=2, ensure_ascii=False)
+        _write_json_file(filepath, file_content)
         
         click.echo(f"- {desc}")
         click.echo(f"  └─ Salvo em: {filepath}")
 
     log_message(f"\n{len(scenarios)} cenários foram salvos com sucesso em '{cases_dir}'.")
-    log_message(click.style(f"Lembrete: A suíte '{suite_name}' irá procurar por uma State Machine com o nome '{suite_name}' na AWS.", fg='magenta'))
+    log_message(_style(f"Lembrete: A suíte '{suite_name}' irá procurar por uma State Machine com o nome '{suite_name}' na AWS.", fg='magenta'))
 
 
 if __name__ == '__main__':
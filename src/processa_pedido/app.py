@@ -4,6 +4,7 @@ import uuid
 import os
 import boto3
 import traceback
+from botocore.config import Config
 from datetime import datetime
 from typing import Dict, Literal, List
 from boto3.dynamodb.conditions import Key
@@ -11,9 +12,23 @@ from pydantic import BaseModel, ValidationError, Field
 
 DYNAMODB_TABLE_NAME = os.environ.get("PEDIDOS_TABLE_NAME")
 
-dynamodb = boto3.resource('dynamodb')
+# Criados uma única vez por container e reaproveitados entre invocações "quentes";
+# o keepalive mantém a conexão TLS com o DynamoDB aberta entre elas.
+DYNAMODB_CONFIG = Config(
+    tcp_keepalive=True,
+    retries={'max_attempts': 5, 'mode': 'adaptive'},
+)
+
+dynamodb = boto3.resource('dynamodb', config=DYNAMODB_CONFIG)
 table = dynamodb.Table(DYNAMODB_TABLE_NAME)
 
+# Abre a conexão com o DynamoDB durante o INIT, para que o handshake TLS não recaia sobre a
+# primeira requisição. Falhas aqui não impedem a inicialização: o handler reconecta sozinho.
+try:
+    table.meta.client.describe_table(TableName=DYNAMODB_TABLE_NAME)
+except Exception as e:
+    print(f"Aviso: não foi possível pré-aquecer a conexão com o DynamoDB: {e}")
+
 class ItemPedido(BaseModel):
     """Define os detalhes de um item, cujo ID é a chave do dicionário."""
     nome: str
@@ -36,9 +51,9 @@ def lambda_handler(event, context):
     """
 
     try:
-        # 1. Parse e validação em um único passo com Pydantic
-        body_data = json.loads(event.get('body', '{}'))
-        pedido_validado = Pedido(**body_data)
+        # 1. Parse e validação em um único passo com Pydantic: o JSON é lido direto pelo
+        # parser nativo (Rust) do pydantic-core, sem criar um dict intermediário
+        pedido_validado = Pedido.model_validate_json(event.get('body', '{}'))
         
         pedido_id = str(uuid.uuid4())
         status_pedido = "PENDENTE"
@@ -48,9 +63,11 @@ def lambda_handler(event, context):
         itens_resumo = ", ".join([f"{item.quantidade}x {item.nome}" for item_id, item in pedido_validado.items.items()])
         print(f"Pedido {pedido_id} contendo [{itens_resumo}] recebido. Status: {status_pedido} em {current_timestamp}")
         
-        # Verifica se o cliente existe
+        # Verifica se o cliente existe: basta um item, e só a chave é lida
         client = table.query(
-            KeyConditionExpression=Key('pedidoId').eq(pedido_validado.clienteId)
+            KeyConditionExpression=Key('pedidoId').eq(pedido_validado.clienteId),
+            ProjectionExpression='pedidoId',
+            Limit=1
         )
         if not client.get('Items'):
             print(f"Cliente {pedido_validado.clienteId} não encontrado.")
@@ -88,14 +105,15 @@ def lambda_handler(event, context):
             })
         }
 
-    except json.JSONDecodeError:
-        print("Erro: Corpo da requisição inválido (não é um JSON válido).")
-        traceback.print_exc()
-        return {
-            'statusCode': 400,
-            'body': json.dumps({'message': 'Requisição inválida: Corpo deve ser um JSON válido.'})
-        }
     except ValidationError as e:
+        # JSON malformado também chega como ValidationError (tipo 'json_invalid')
+        if any(error['type'] == 'json_invalid' for error in e.errors()):
+            print("Erro: Corpo da requisição inválido (não é um JSON válido).")
+            traceback.print_exc()
+            return {
+                'statusCode': 400,
+                'body': json.dumps({'message': 'Requisição inválida: Corpo deve ser um JSON válido.'})
+            }
         # Pydantic levanta ValidationError com detalhes sobre os campos inválidos
         print(f"Erro de validação: {e.errors()}")
         traceback.print_exc()